@@ -1,6 +1,7 @@
 from nrt_rainfall_pipeline.pipeline import Pipeline
 from nrt_rainfall_pipeline.secrets_settings import Secrets
 from nrt_rainfall_pipeline.settings import Settings
+from nrt_rainfall_pipeline.transport import Transport
 from datetime import timezone, datetime, timedelta
 import click
 
@@ -28,12 +29,58 @@ import click
     help="date end in YYYY-mm-dd",
     default=(datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d"),
 )
-def run_nrt_rainfall_pipeline(country, extract, transform, send, save, dateend):
+@click.option(
+    "--http-mode",
+    help="live: use the real servers, record: also save responses to cassettes, replay: serve responses from cassettes",
+    type=click.Choice(["live", "record", "replay"]),
+    default="live",
+)
+@click.option(
+    "--cassette-dir",
+    help="directory where HTTP responses are recorded to and replayed from",
+    default="./data/cassettes",
+)
+@click.option(
+    "--replay-latency",
+    help="seconds to wait before serving each replayed response",
+    default=0.0,
+)
+@click.option(
+    "--replay-error-rate",
+    help="fraction (0-1) of replayed requests that fail; failed requests are retried up to 5 times before the run stops",
+    default=0.0,
+)
+@click.option(
+    "--replay-seed",
+    help="seed for the replayed request failures, to make runs reproducible",
+    type=int,
+    default=None,
+)
+def run_nrt_rainfall_pipeline(
+    country,
+    extract,
+    transform,
+    send,
+    save,
+    dateend,
+    http_mode,
+    cassette_dir,
+    replay_latency,
+    replay_error_rate,
+    replay_seed,
+):
     dateend = datetime.strptime(dateend, "%Y-%m-%d")
     pipe = Pipeline(
         country=country,
         settings=Settings("config/config.yaml"),
         secrets=Secrets(".env"),
+        transport=Transport(
+            mode=http_mode,
+            cassette_dir=cassette_dir,
+            latency=replay_latency,
+            error_rate=replay_error_rate,
+            seed=replay_seed,
+        ),
     )
     pipe.run_pipeline(
         extract=extract, transform=transform, send=send, save=save, dateend=dateend
@@ -1,5 +1,5 @@
-import requests
 import urllib
+from nrt_rainfall_pipeline.transport import Transport
 
 class EspoAPIError(Exception):
     """An exception class for the client"""
@@ -37,9 +37,10 @@ class EspoAPI:
 
     url_path = '/api/v1/'
 
-    def __init__(self, url, api_key):
+    def __init__(self, url, api_key, transport=None):
         self.url = url
         self.api_key = api_key
+        self.transport = transport if transport is not None else Transport()
         self.status_code = None
 
     def request(self, method, action, params=None):
@@ -61,7 +62,7 @@ class EspoAPI:
         else:
             kwargs['url'] = kwargs['url'] + '?' + http_build_query(params)
 
-        response = requests.request(method, **kwargs)
+        response = self.transport.request(method, **kwargs)
 
         self.status_code = response.status_code
 
@@ -1,15 +1,15 @@
+import numpy as np
 import rasterio
-from rasterio.mask import mask
+from rasterio.mask import raster_geometry_mask
 from datetime import timedelta
 import os
-import subprocess
-import time
 import urllib
 import geopandas as gpd
 from zipfile import ZipFile
 from nrt_rainfall_pipeline.secrets_settings import Secrets
 from nrt_rainfall_pipeline.settings import Settings
 from nrt_rainfall_pipeline.load import Load
+from nrt_rainfall_pipeline.transport import Transport
 from nrt_rainfall_pipeline.logger import logger
 
 
@@ -18,11 +18,18 @@ class Extract:
     Extract near real-time observed rainfall data from external sources
     """
 
-    def __init__(self, settings: Settings = None, secrets: Secrets = None):
+    def __init__(
+        self,
+        settings: Settings = None,
+        secrets: Secrets = None,
+        transport: Transport = None,
+    ):
         self.secrets = None
         self.settings = None
-        self.load = Load()
+        self.transport = transport if transport is not None else Transport()
+        self.load = Load(transport=self.transport)
         self.inputGPM = "./data/gpm"
+        self.clip_masks = {}
         if not os.path.exists(self.inputGPM):
             os.makedirs(self.inputGPM)
         if settings is not None:
@@ -97,27 +104,17 @@ class Extract:
                 is_file_available = self.__get_rainfall(
                     username, password, file_name, file_url
                 )
-                time.sleep(10)
+                self.transport.wait(10)
                 break
             except urllib.error.URLError:
                 attempt += 1
-                time.sleep(120)
+                self.transport.wait(120)
         if attempt == no_attempts:
             raise ConnectionError("GPM server not available")
         return is_file_available
 
     def __get_rainfall(self, username, password, file_name, file_url) -> bool:
-        if not os.path.isfile(f"{self.inputGPM}/{file_name}.zip"):
-            download_command = f"""wget -P {self.inputGPM} --user={username} --password={password} {file_url}"""
-            try:
-                subprocess.call(
-                    download_command,
-                    cwd=".",
-                    stderr=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                )
-            except FileNotFoundError:
-                pass
+        self.transport.download(file_url, self.inputGPM, username, password)
         if os.path.exists(f"{self.inputGPM}/{file_name}.zip"):
             with ZipFile(f"{self.inputGPM}/{file_name}.zip", "r") as zf:
                 zf.extract(f"{file_name}.tif", path=f"{self.inputGPM}")
@@ -127,12 +124,11 @@ class Extract:
         """
         For each date (file), slice it to the extent of the country
         """
-        shp_name = self.settings.get_country_setting(self.country, "shapefile-area")
-        shp_dir = f"data/admin_boundary/{shp_name}"
-        shapefile = gpd.read_file(f"{shp_dir}")
-        shapes = [feature["geometry"] for feature in shapefile.iterfeatures()]
         with rasterio.open(f"{self.inputGPM}/{file_name}.tif") as src:
-            out_image, out_transform = mask(src, shapes, crop=True)
+            clip_mask, out_transform, window = self.__get_clip_mask(src)
+            nodata = src.nodata if src.nodata is not None else 0
+            out_image = src.read(window=window)
+            out_image[:, clip_mask] = nodata
             out_meta = src.meta
         out_meta.update(
             {
@@ -146,3 +142,20 @@ class Extract:
             f"{self.inputGPM}/{self.country}_{file_name}.tif", "w", **out_meta
         ) as dest:
             dest.write(out_image)
+
+    def __get_clip_mask(self, src):
+        """
+        Return the pixel mask of the country, its transform and bounding window.
+        The mask is computed once per country and raster grid, then reused
+        for every day since all IMERG files share the same grid
+        """
+        key = (self.country, src.crs, src.transform, src.width, src.height)
+        if key not in self.clip_masks:
+            shp_name = self.settings.get_country_setting(self.country, "shapefile-area")
+            shp_dir = f"data/admin_boundary/{shp_name}"
+            shapefile = gpd.read_file(f"{shp_dir}")
+            clip_mask, out_transform, window = raster_geometry_mask(
+                src, list(shapefile.geometry), crop=True
+            )
+            self.clip_masks[key] = (np.asarray(clip_mask), out_transform, window)
+        return self.clip_masks[key]
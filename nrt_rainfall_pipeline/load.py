@@ -1,15 +1,22 @@
 from __future__ import annotations
 from nrt_rainfall_pipeline.secrets_settings import Secrets
 from nrt_rainfall_pipeline.settings import Settings
-from nrt_rainfall_pipeline.espo_api_client import EspoAPI
+from nrt_rainfall_pipeline.espo_api_client import EspoAPI, EspoAPIError
+from nrt_rainfall_pipeline.transport import Transport
 from nrt_rainfall_pipeline.logger import logger
 
 
 class Load:
 
-    def __init__(self, settings: Settings = None, secrets: Secrets = None):
+    def __init__(
+        self,
+        settings: Settings = None,
+        secrets: Secrets = None,
+        transport: Transport = None,
+    ):
         self.secrets = None
         self.settings = None
+        self.transport = transport if transport is not None else Transport()
         if settings is not None:
             self.set_settings(settings)
         if secrets is not None:
@@ -38,9 +45,10 @@ class Load:
         espo_client = EspoAPI(
             self.secrets.get_secret("ESPOCRM_URL"),
             self.secrets.get_secret("ESPOCRM_API_KEY"),
+            transport=self.transport,
         )
         for data in data:
-            espo_client.request("POST", entity, data)
+            self.__request_espo(espo_client, "POST", entity, data)
 
     def get_admin_id(self, entity: str, pcode_col: str):
         """
@@ -49,12 +57,29 @@ class Load:
         espo_client = EspoAPI(
             self.secrets.get_secret("ESPOCRM_URL"),
             self.secrets.get_secret("ESPOCRM_API_KEY"),
+            transport=self.transport,
         )
-        admin1 = espo_client.request("GET", entity)
+        admin1 = self.__request_espo(espo_client, "GET", entity)
         admin1_filtered = self.__filter_dict(admin1["list"], [pcode_col, "id"])
         admin1_pcode_id = dict(item.values() for item in admin1_filtered)
         return admin1_pcode_id
 
+    def __request_espo(self, espo_client, method, action, params=None):
+        """
+        Send a request to EspoCRM.
+        Retry 5 times max if the server returns an error (5xx)
+        """
+        no_attempts, attempt = 5, 0
+        while attempt < no_attempts:
+            try:
+                return espo_client.request(method, action, params)
+            except EspoAPIError:
+                if espo_client.status_code is None or espo_client.status_code < 500:
+                    raise
+                attempt += 1
+                self.transport.wait(30)
+        raise ConnectionError("EspoCRM server not available")
+
     # transform
     def __filter_dict(self, dict: list, selected_keys: list):
         """
@@ -3,6 +3,7 @@ from nrt_rainfall_pipeline.load import Load
 from nrt_rainfall_pipeline.transform import Transform
 from nrt_rainfall_pipeline.secrets_settings import Secrets
 from nrt_rainfall_pipeline.settings import Settings
+from nrt_rainfall_pipeline.transport import Transport
 from nrt_rainfall_pipeline.logger import logger
 from datetime import datetime, timezone
 
@@ -10,14 +11,25 @@ from datetime import datetime, timezone
 class Pipeline:
     """Base class for flood data pipeline"""
 
-    def __init__(self, settings: Settings, secrets: Secrets, country: str):
+    def __init__(
+        self,
+        settings: Settings,
+        secrets: Secrets,
+        country: str,
+        transport: Transport = None,
+    ):
         self.settings = settings
         if country not in [c["name"] for c in self.settings.get_setting("countries")]:
             raise ValueError(f"No config found for country {country}")
         self.country = country
-        self.load = Load(settings=settings, secrets=secrets)
-        self.extract = Extract(settings=settings, secrets=secrets)
-        self.transfrom = Transform(settings=settings, secrets=secrets)
+        self.transport = transport if transport is not None else Transport()
+        self.load = Load(settings=settings, secrets=secrets, transport=self.transport)
+        self.extract = Extract(
+            settings=settings, secrets=secrets, transport=self.transport
+        )
+        self.transfrom = Transform(
+            settings=settings, secrets=secrets, transport=self.transport
+        )
 
     def run_pipeline(
         self,
@@ -7,15 +7,21 @@ from rasterstats import zonal_stats
 from nrt_rainfall_pipeline.secrets_settings import Secrets
 from nrt_rainfall_pipeline.settings import Settings
 from nrt_rainfall_pipeline.load import Load
+from nrt_rainfall_pipeline.transport import Transport
 from nrt_rainfall_pipeline.logger import logger
 
 
 class Transform:
 
-    def __init__(self, settings: Settings = None, secrets: Secrets = None):
+    def __init__(
+        self,
+        settings: Settings = None,
+        secrets: Secrets = None,
+        transport: Transport = None,
+    ):
         self.secrets = None
         self.settings = None
-        self.load = Load()
+        self.load = Load(transport=transport)
         self.inputGPM = "./data/gpm"
         if settings is not None:
             self.set_settings(settings)
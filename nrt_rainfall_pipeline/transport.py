@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import random
+import shutil
+import hashlib
+import subprocess
+import urllib.error
+from enum import Enum
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# only these response headers are recorded, to keep cookies and encoding
+# headers (the body is stored decoded) out of the cassettes
+RECORDED_HEADERS = ["content-type", "x-status-reason"]
+
+
+class TransportMode(Enum):
+    live = "live"
+    record = "record"
+    replay = "replay"
+
+
+class Transport:
+    """
+    HTTP layer shared by the EOSDIS download and the EspoCRM client.
+    In live mode requests go to the real servers; in record mode responses
+    are also saved to a cassette directory; in replay mode they are served
+    from the cassette directory, with optional latency and error injection
+    """
+
+    def __init__(
+        self,
+        mode="live",
+        cassette_dir="./data/cassettes",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        self.mode = TransportMode(mode)
+        self.cassette_dir = cassette_dir
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        if self.mode is not TransportMode.live and not os.path.exists(
+            self.cassette_dir
+        ):
+            if self.mode is TransportMode.replay:
+                raise ValueError(f"Cassette directory {self.cassette_dir} not found")
+            os.makedirs(self.cassette_dir)
+
+    def request(self, method, url, headers=None, json=None) -> requests.Response:
+        """
+        Send an HTTP request and return the response
+        """
+        key = self.__cassette_key(method, url, json)
+        if self.mode is TransportMode.replay:
+            self.__simulate_network()
+            if self.__inject_error():
+                return self.__build_response(
+                    503, {"X-Status-Reason": "Injected error"}, b""
+                )
+            return self.__replay_response(key, method, url)
+        response = requests.request(method, url=url, headers=headers, json=json)
+        if self.mode is TransportMode.record:
+            self.__record_response(key, method, url, response)
+        return response
+
+    def download(self, url, directory, username, password):
+        """
+        Download a file into directory with wget (live, record) or copy it
+        from the cassette directory (replay).
+        Files already in directory are not downloaded again, but are still
+        recorded to the cassette directory in record mode. Failed downloads
+        are recorded without a body and replayed as a missing file
+        """
+        file_name = url.split("/")[-1]
+        file_path = f"{directory}/{file_name}"
+        key = self.__cassette_key("GET", url)
+        if self.mode is TransportMode.replay:
+            self.__simulate_network()
+            if self.__inject_error():
+                raise urllib.error.URLError(f"Injected error for {url}")
+            body_path = f"{self.cassette_dir}/{key}.body"
+            if os.path.exists(body_path):
+                shutil.copyfile(body_path, file_path)
+            elif not os.path.exists(f"{self.cassette_dir}/{key}.json"):
+                raise FileNotFoundError(
+                    f"No recorded response for GET {url} in {self.cassette_dir}"
+                )
+            return
+        is_downloaded = os.path.isfile(file_path)
+        return_code = None
+        if not is_downloaded:
+            download_command = [
+                "wget",
+                "-P",
+                directory,
+                f"--user={username}",
+                f"--password={password}",
+                url,
+            ]
+            try:
+                return_code = subprocess.call(
+                    download_command,
+                    cwd=".",
+                    stderr=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                )
+                is_downloaded = return_code == 0 and os.path.isfile(file_path)
+            except FileNotFoundError:
+                pass
+            if not is_downloaded and os.path.isfile(file_path):
+                # remove partial download
+                os.remove(file_path)
+        if self.mode is TransportMode.record:
+            body_path = f"{self.cassette_dir}/{key}.body"
+            if is_downloaded:
+                shutil.copyfile(file_path, body_path)
+                meta = {"method": "GET", "url": url, "status_code": 200}
+            else:
+                if os.path.exists(body_path):
+                    os.remove(body_path)
+                meta = {"method": "GET", "url": url, "wget_exit_code": return_code}
+            self.__write_meta(key, meta)
+
+    def wait(self, seconds: float):
+        """
+        Wait between requests (throttling, retry backoff). Skipped in replay
+        mode, where the wait is simulated by latency instead
+        """
+        if self.mode is not TransportMode.replay:
+            time.sleep(seconds)
+
+    def __cassette_key(self, method, url, body=None):
+        """
+        Hash method, url and body into a cassette file name.
+        Headers are left out so that API keys are not part of the key
+        """
+        payload = json.dumps(
+            {"method": method, "url": url, "body": body}, sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def __record_response(self, key, method, url, response):
+        with open(f"{self.cassette_dir}/{key}.body", "wb") as file:
+            file.write(response.content)
+        self.__write_meta(
+            key,
+            {
+                "method": method,
+                "url": url,
+                "status_code": response.status_code,
+                "headers": {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() in RECORDED_HEADERS
+                },
+            },
+        )
+
+    def __write_meta(self, key, meta):
+        with open(f"{self.cassette_dir}/{key}.json", "w") as file:
+            json.dump(meta, file, indent=2)
+
+    def __replay_response(self, key, method, url):
+        meta_path = f"{self.cassette_dir}/{key}.json"
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(
+                f"No recorded response for {method} {url} in {self.cassette_dir}"
+            )
+        with open(meta_path) as file:
+            meta = json.load(file)
+        with open(f"{self.cassette_dir}/{key}.body", "rb") as file:
+            content = file.read()
+        return self.__build_response(
+            meta["status_code"], meta.get("headers", {}), content
+        )
+
+    def __build_response(self, status_code, headers, content):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        return response
+
+    def __simulate_network(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def __inject_error(self) -> bool:
+        return self.random.random() < self.error_rate
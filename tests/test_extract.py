@@ -0,0 +1,94 @@
+import time
+import numpy as np
+import pytest
+import rasterio
+import geopandas as gpd
+from rasterio.mask import mask
+from rasterio.transform import from_origin
+from shapely.geometry import box
+from nrt_rainfall_pipeline import extract
+from nrt_rainfall_pipeline.extract import Extract
+from nrt_rainfall_pipeline.settings import Settings
+from nrt_rainfall_pipeline.transport import Transport
+
+
+FILE_NAMES = [
+    "3B-DAY-L.GIS.IMERG.20241001.V07B",
+    "3B-DAY-L.GIS.IMERG.20241002.V07B",
+]
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.yaml").write_text(
+        "countries:\n"
+        "  - name: CMR\n"
+        "    days-to-observe: 2\n"
+        "    alert-on-threshold: 50\n"
+        "    shapefile-area: districts.geojson\n"
+    )
+    (tmp_path / "data" / "admin_boundary").mkdir(parents=True)
+    districts = gpd.GeoDataFrame(
+        {"code": ["001", "002"]},
+        geometry=[box(1.3, -6.7, 4.0, -2.2), box(4.0, -5.8, 6.6, -3.1)],
+        crs="EPSG:4326",
+    )
+    districts.to_file(tmp_path / "data" / "admin_boundary" / "districts.geojson")
+    extractor = Extract(settings=Settings(str(tmp_path / "config.yaml")))
+    extractor.country = "CMR"
+    return extractor
+
+
+def write_raster(path, seed):
+    data = np.random.default_rng(seed).random((1, 10, 10)).astype("float32")
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=10,
+        width=10,
+        count=1,
+        dtype="float32",
+        crs="EPSG:4326",
+        transform=from_origin(1.0, -1.0, 1.0, 1.0),
+        nodata=-9999.0,
+    ) as dst:
+        dst.write(data)
+
+
+def test_prepare_rainfall_data_matches_mask(extractor, monkeypatch):
+    read_file_calls = []
+    read_file = gpd.read_file
+    monkeypatch.setattr(
+        extract.gpd,
+        "read_file",
+        lambda *args, **kwargs: read_file_calls.append(args) or read_file(*args),
+    )
+    shapes = list(read_file("data/admin_boundary/districts.geojson").geometry)
+    for seed, file_name in enumerate(FILE_NAMES):
+        write_raster(f"{extractor.inputGPM}/{file_name}.tif", seed)
+        extractor._Extract__prepare_rainfall_data(file_name)
+
+        with rasterio.open(f"{extractor.inputGPM}/{file_name}.tif") as src:
+            expected_image, expected_transform = mask(src, shapes, crop=True)
+        with rasterio.open(f"{extractor.inputGPM}/CMR_{file_name}.tif") as out:
+            assert out.transform == expected_transform
+            np.testing.assert_array_equal(out.read(), expected_image)
+
+    # the clip mask is computed once and reused for the following days
+    assert len(read_file_calls) == 1
+    assert len(extractor.clip_masks) == 1
+
+
+def test_download_rainfall_replay_errors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(time, "sleep", lambda seconds: pytest.fail("slept"))
+    extractor = Extract(transport=Transport("replay", str(tmp_path), error_rate=1.0))
+    with pytest.raises(ConnectionError, match="GPM server not available"):
+        extractor._Extract__download_rainfall(
+            "user",
+            "pwd",
+            FILE_NAMES[0],
+            f"https://gpm.example.org/imerg/gis/2024/10/{FILE_NAMES[0]}.zip",
+        )
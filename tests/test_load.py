@@ -0,0 +1,42 @@
+import json
+import time
+import pytest
+from nrt_rainfall_pipeline.espo_api_client import EspoAPIError
+from nrt_rainfall_pipeline.load import Load
+from nrt_rainfall_pipeline.secrets_settings import Secrets
+from nrt_rainfall_pipeline.transport import Transport
+
+
+@pytest.fixture
+def secrets(tmp_path):
+    path = tmp_path / "secrets.json"
+    path.write_text(
+        json.dumps(
+            {"ESPOCRM_URL": "https://crm.example.org", "ESPOCRM_API_KEY": "key"}
+        )
+    )
+    return Secrets(str(path))
+
+
+def test_get_admin_id_replay_errors(tmp_path, monkeypatch, secrets):
+    monkeypatch.setattr(time, "sleep", lambda seconds: pytest.fail("slept"))
+    transport = Transport("replay", str(tmp_path), error_rate=1.0)
+    load = Load(secrets=secrets, transport=transport)
+    with pytest.raises(ConnectionError, match="EspoCRM server not available"):
+        load.get_admin_id("CHealthDistrict", "code")
+
+
+def test_get_admin_id_no_retry_on_client_error(tmp_path, monkeypatch, secrets):
+    calls = []
+
+    def request(self, method, url, headers=None, json=None):
+        calls.append(url)
+        return self._Transport__build_response(
+            400, {"X-Status-Reason": "Bad request"}, b""
+        )
+
+    monkeypatch.setattr(Transport, "request", request)
+    load = Load(secrets=secrets, transport=Transport())
+    with pytest.raises(EspoAPIError):
+        load.get_admin_id("CHealthDistrict", "code")
+    assert len(calls) == 1
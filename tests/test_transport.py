@@ -0,0 +1,128 @@
+import json
+import subprocess
+import urllib.error
+import pytest
+import requests
+from nrt_rainfall_pipeline.transport import Transport
+
+
+URL = "https://crm.example.org/api/v1/CHealthDistrict"
+FILE_URL = "https://gpm.example.org/imerg/gis/2024/10/3B-DAY-L.GIS.IMERG.20241001.V07B.zip"
+
+
+def fake_response(status_code, headers, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response._content = content
+    return response
+
+
+def test_request_record_replay(tmp_path, monkeypatch):
+    cassettes = tmp_path / "cassettes"
+    body = json.dumps({"list": [{"code": "001", "id": "a"}]}).encode()
+    monkeypatch.setattr(
+        requests,
+        "request",
+        lambda *args, **kwargs: fake_response(
+            200,
+            {"Content-Type": "application/json", "Set-Cookie": "session=secret"},
+            body,
+        ),
+    )
+    recorded = Transport("record", str(cassettes)).request(
+        "GET", URL, headers={"X-Api-Key": "secret"}
+    )
+    assert recorded.json() == {"list": [{"code": "001", "id": "a"}]}
+
+    monkeypatch.setattr(requests, "request", None)
+    replayed = Transport("replay", str(cassettes)).request("GET", URL)
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["Content-Type"] == "application/json"
+    assert "Set-Cookie" not in replayed.headers
+    for path in cassettes.iterdir():
+        assert b"secret" not in path.read_bytes()
+
+
+def test_request_replay_miss(tmp_path):
+    transport = Transport("replay", str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="No recorded response"):
+        transport.request("POST", URL, json={"code": "001"})
+
+
+def test_download_record_replay(tmp_path, monkeypatch):
+    cassettes = tmp_path / "cassettes"
+    gpm = tmp_path / "gpm"
+    gpm.mkdir()
+    file_name = FILE_URL.split("/")[-1]
+    (gpm / file_name).write_bytes(b"zip content")
+    # a file already on disk is recorded without downloading it again
+    monkeypatch.setattr(subprocess, "call", None)
+    Transport("record", str(cassettes)).download(FILE_URL, str(gpm), "user", "pwd")
+
+    (gpm / file_name).unlink()
+    Transport("replay", str(cassettes)).download(FILE_URL, str(gpm), "user", "pwd")
+    assert (gpm / file_name).read_bytes() == b"zip content"
+
+
+def test_download_failed_not_recorded(tmp_path, monkeypatch):
+    cassettes = tmp_path / "cassettes"
+    gpm = tmp_path / "gpm"
+    gpm.mkdir()
+    file_name = FILE_URL.split("/")[-1]
+
+    def failed_wget(command, **kwargs):
+        assert command[:3] == ["wget", "-P", str(gpm)]
+        assert "--password=p w d" in command
+        (gpm / file_name).write_bytes(b"partial")
+        return 4
+
+    monkeypatch.setattr(subprocess, "call", failed_wget)
+    for _ in range(2):
+        Transport("record", str(cassettes)).download(
+            FILE_URL, str(gpm), "user", "p w d"
+        )
+        assert not (gpm / file_name).exists()
+        assert list(cassettes.glob("*.body")) == []
+
+
+def test_download_unavailable_record_replay(tmp_path, monkeypatch):
+    cassettes = tmp_path / "cassettes"
+    gpm = tmp_path / "gpm"
+    gpm.mkdir()
+    file_name = FILE_URL.split("/")[-1]
+    monkeypatch.setattr(subprocess, "call", lambda command, **kwargs: 8)
+    Transport("record", str(cassettes)).download(FILE_URL, str(gpm), "user", "pwd")
+
+    monkeypatch.setattr(subprocess, "call", None)
+    Transport("replay", str(cassettes)).download(FILE_URL, str(gpm), "user", "pwd")
+    assert not (gpm / file_name).exists()
+
+
+def test_download_replay_miss(tmp_path):
+    transport = Transport("replay", str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="No recorded response for GET"):
+        transport.download(FILE_URL, str(tmp_path), "user", "pwd")
+
+
+def test_error_injection(tmp_path):
+    transport = Transport("replay", str(tmp_path), error_rate=1.0)
+    response = transport.request("GET", URL)
+    assert response.status_code == 503
+    assert response.headers["X-Status-Reason"] == "Injected error"
+    with pytest.raises(urllib.error.URLError):
+        transport.download(FILE_URL, str(tmp_path), "user", "pwd")
+
+
+def test_error_injection_seeded(tmp_path, monkeypatch):
+    def injected(seed):
+        transport = Transport("replay", str(tmp_path), error_rate=0.5, seed=seed)
+        return [transport.request("GET", URL).status_code == 503 for _ in range(20)]
+
+    monkeypatch.setattr(
+        Transport,
+        "_Transport__replay_response",
+        lambda self, key, method, url: fake_response(200, {}, b"{}"),
+    )
+    assert injected(42) == injected(42)